@@ -2,15 +2,40 @@
 """
 HTML to PDF Converter
 将HTML报告转换为PDF格式
+
+静态HTML使用weasyprint在多进程中批量转换；包含 <script> 的页面
+回退到 Playwright（见 convert_to_pdf_v2.py）渲染。
 """
 
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+SCRIPT_TAG_RE = re.compile(r"<script\b", re.IGNORECASE)
+
+
+def _render_one(job):
+    """子进程中使用weasyprint转换单个HTML文件"""
+    from weasyprint import HTML
+
+    html_path, pdf_path = job
+    try:
+        HTML(filename=str(html_path)).write_pdf(str(pdf_path))
+        return pdf_path, None
+    except Exception as e:
+        return pdf_path, str(e)
+
+
+def _needs_browser(html_path):
+    """页面包含脚本时，weasyprint无法执行，需要交给浏览器渲染"""
+    return bool(SCRIPT_TAG_RE.search(html_path.read_text(encoding='utf-8', errors='ignore')))
+
+
 def convert_html_to_pdf():
     """使用weasyprint将HTML文件转换为PDF"""
     try:
-        from weasyprint import HTML
+        from weasyprint import HTML  # noqa: F401  仅用于检查依赖
 
         # 当前目录
         current_dir = Path(__file__).parent
@@ -21,6 +46,8 @@ def convert_html_to_pdf():
             'openalex_authors_report.html'
         ]
 
+        jobs = []
+        browser_jobs = []
         for html_file in html_files:
             html_path = current_dir / html_file
             pdf_file = html_file.replace('.html', '.pdf')
@@ -30,15 +57,41 @@ def convert_html_to_pdf():
                 print(f"错误: 找不到文件 {html_path}")
                 continue
 
-            print(f"正在转换: {html_file} -> {pdf_file}")
+            if _needs_browser(html_path):
+                # render_one 会打印浏览器任务自己的进度
+                browser_jobs.append((html_path, pdf_path))
+            else:
+                print(f"正在转换: {html_file} -> {pdf_file}")
+                jobs.append((html_path, pdf_path))
+
+        if jobs:
+            max_workers = min(len(jobs), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as ex:
+                for pdf_path, error in ex.map(_render_one, jobs):
+                    if error is None:
+                        print(f"✓ 成功生成: {pdf_path.name}")
+                        print(f"  文件大小: {pdf_path.stat().st_size / 1024:.2f} KB")
+                    else:
+                        print(f"✗ 转换失败 {pdf_path.name}: {error}")
+
+        if browser_jobs:
+            import asyncio
+            from convert_to_pdf_v2 import convert_files, shutdown
+
+            async def _render_in_browser():
+                try:
+                    await convert_files(browser_jobs)
+                finally:
+                    await shutdown()
 
+            print("检测到脚本，使用 Playwright 渲染: "
+                  + ", ".join(html_path.name for html_path, _ in browser_jobs))
             try:
-                # 转换HTML到PDF
-                HTML(filename=str(html_path)).write_pdf(str(pdf_path))
-                print(f"✓ 成功生成: {pdf_file}")
-                print(f"  文件大小: {pdf_path.stat().st_size / 1024:.2f} KB")
-            except Exception as e:
-                print(f"✗ 转换失败 {html_file}: {str(e)}")
+                asyncio.run(_render_in_browser())
+            except ImportError:
+                # 与下方 weasyprint 缺失的处理分开，避免误装 weasyprint
+                print("错误: 未安装 playwright 库，无法转换包含脚本的页面")
+                print("请运行: pip install playwright && playwright install chromium")
 
         print("\n转换完成!")
 
@@ -2,16 +2,146 @@
 """
 HTML to PDF Converter using Playwright
 使用Playwright将HTML报告转换为PDF格式
+
+PdfRenderer 在首次使用时启动 Chromium 并常驻复用，每个转换任务
+只新建独立的 BrowserContext，避免重复的浏览器冷启动开销。
 """
 
+import atexit
 import os
+import threading
 from pathlib import Path
 import asyncio
 
+
+async def render_one(context, html_path: Path, pdf_path: Path):
+    """在独立的 BrowserContext 中渲染单个HTML文件"""
+    print(f"正在转换: {html_path.name} -> {pdf_path.name}")
+    try:
+        page = await context.new_page()
+
+        # 打开HTML文件
+        await page.goto(f'file:///{html_path.as_posix()}')
+
+        # 转换为PDF
+        await page.pdf(
+            path=str(pdf_path),
+            format='A4',
+            print_background=True,
+            margin={
+                'top': '10mm',
+                'right': '10mm',
+                'bottom': '10mm',
+                'left': '10mm'
+            }
+        )
+        await page.close()
+
+        print(f"[成功] 生成: {pdf_path.name}")
+        print(f"  文件大小: {pdf_path.stat().st_size / 1024:.2f} KB")
+    except Exception as e:
+        print(f"[失败] 转换 {html_path.name}: {str(e)}")
+    finally:
+        await context.close()
+
+
+class PdfRenderer:
+    """常驻的 Chromium 渲染器：浏览器只启动一次，每个任务使用新的 context
+
+    浏览器绑定在创建它的事件循环上，因此渲染器在独立的后台线程中运行
+    一个常驻事件循环；调用方无论来自哪个 asyncio.run()，都把任务提交到
+    该循环执行，浏览器得以跨多次调用复用，退出时也总能被正常关闭。
+    """
+
+    def __init__(self):
+        self._pw = None
+        self._browser = None
+        self._loop = None
+        self._lock = asyncio.Lock()
+        self._loop_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="pdf-renderer", daemon=True).start()
+        return self._loop
+
+    async def _submit(self, coro):
+        """在渲染器自己的事件循环中执行 coro，并在调用方的循环中等待结果"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()))
+
+    async def ensure_started(self):
+        # 只在渲染器循环中调用
+        async with self._lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+
+                self._pw = await async_playwright().start()
+                self._browser = await self._pw.chromium.launch()
+        return self._browser
+
+    async def _render(self, html_path: Path, pdf_path: Path):
+        browser = await self.ensure_started()
+        await render_one(await browser.new_context(), html_path, pdf_path)
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def render(self, html_path: Path, pdf_path: Path):
+        await self._submit(self._render(html_path, pdf_path))
+
+    async def shutdown(self):
+        if self._loop is not None:
+            await self._submit(self._shutdown())
+
+    def _shutdown_at_exit(self):
+        # 渲染器循环常驻于后台线程，退出时仍可在其中优雅关闭浏览器
+        if self._loop is None:
+            return
+        if self._browser is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=30)
+            except Exception as e:
+                print(f"[警告] 关闭浏览器失败: {str(e)}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_renderer = None
+
+
+def get_renderer():
+    """返回模块级共享的 PdfRenderer"""
+    global _renderer
+    if _renderer is None:
+        _renderer = PdfRenderer()
+        atexit.register(_renderer._shutdown_at_exit)
+    return _renderer
+
+
+async def render(html_path: Path, pdf_path: Path):
+    """使用常驻浏览器渲染单个文件"""
+    await get_renderer().render(html_path, pdf_path)
+
+
+async def shutdown():
+    await get_renderer().shutdown()
+
+
+async def convert_files(jobs):
+    """复用常驻浏览器，每个 (html_path, pdf_path) 并发渲染"""
+    await asyncio.gather(*[render(html_path, pdf_path) for html_path, pdf_path in jobs])
+
+
 async def convert_html_to_pdf():
-    """使用playwright将HTML文件转换为PDF"""
+    """使用playwright将HTML文件转换为PDF（多个文件并发渲染）"""
     try:
-        from playwright.async_api import async_playwright
+        from playwright.async_api import async_playwright  # noqa: F401  仅用于检查依赖
 
         # 当前目录
         current_dir = Path(__file__).parent
@@ -22,45 +152,17 @@ async def convert_html_to_pdf():
             'openalex_authors_report.html'
         ]
 
-        async with async_playwright() as p:
-            # 启动浏览器
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
-
-            for html_file in html_files:
-                html_path = current_dir / html_file
-                pdf_file = html_file.replace('.html', '.pdf')
-                pdf_path = current_dir / pdf_file
-
-                if not html_path.exists():
-                    print(f"错误: 找不到文件 {html_path}")
-                    continue
-
-                print(f"正在转换: {html_file} -> {pdf_file}")
-
-                try:
-                    # 打开HTML文件
-                    await page.goto(f'file:///{html_path.as_posix()}')
-
-                    # 转换为PDF
-                    await page.pdf(
-                        path=str(pdf_path),
-                        format='A4',
-                        print_background=True,
-                        margin={
-                            'top': '10mm',
-                            'right': '10mm',
-                            'bottom': '10mm',
-                            'left': '10mm'
-                        }
-                    )
-
-                    print(f"[成功] 生成: {pdf_file}")
-                    print(f"  文件大小: {pdf_path.stat().st_size / 1024:.2f} KB")
-                except Exception as e:
-                    print(f"[失败] 转换 {html_file}: {str(e)}")
-
-            await browser.close()
+        jobs = []
+        for html_file in html_files:
+            html_path = current_dir / html_file
+            pdf_path = current_dir / html_file.replace('.html', '.pdf')
+
+            if not html_path.exists():
+                print(f"错误: 找不到文件 {html_path}")
+                continue
+            jobs.append((html_path, pdf_path))
+
+        await convert_files(jobs)
 
         print("\n转换完成!")
 
@@ -72,5 +174,12 @@ async def convert_html_to_pdf():
         subprocess.run(['playwright', 'install', 'chromium'], check=True)
         print("安装完成，请重新运行此脚本")
 
+
+async def _main():
+    try:
+        await convert_html_to_pdf()
+    finally:
+        await shutdown()
+
 if __name__ == '__main__':
-    asyncio.run(convert_html_to_pdf())
+    asyncio.run(_main())
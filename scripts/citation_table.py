@@ -0,0 +1,53 @@
+"""
+Load the citation table written by openalex_citations.py for the report scripts.
+
+Both generate_openalex_report.py and generate_author_report.py read the same
+data through `load_dataframe`, with English column names.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+
+
+COLUMNS = [
+    "index",
+    "title",
+    "authors",
+    "author_aff_map",
+    "aff_summary",
+    "year",
+    "source_link",
+    "doi",
+    "venue",
+    "notes",
+]
+
+
+def load_dataframe(csv_path: Path, parquet_path: Path) -> pd.DataFrame:
+    # Prefer the typed Parquet copy written by openalex_citations.py unless the CSV is newer
+    if parquet_path.exists() and (
+        not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass
+    if pacsv is not None:
+        # Multi-threaded Arrow parser; it drops the UTF-8 BOM written by openalex_citations.py.
+        # Quoted titles may span lines, which the parser must be told about.
+        df = pacsv.read_csv(
+            csv_path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        ).to_pandas()
+    else:
+        df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    df.columns = COLUMNS
+    return df
@@ -16,19 +16,24 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import csv
 import datetime
 import json
 import random
 import re
+import sqlite3
 import time
+from collections import Counter
 from dataclasses import dataclass, field, asdict
-from difflib import SequenceMatcher
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
-import pandas as pd
-import requests
-from playwright.async_api import ElementHandle, Page, async_playwright
+import httpx
+from rapidfuzz import process as rf_process
+from rapidfuzz.fuzz import ratio as _rf_ratio
+from playwright.async_api import Page, Route, async_playwright
 
 # Constants --------------------------------------------------------------------
 
@@ -37,31 +42,105 @@ BASE_CITATION_URL = (
     "?oi=bibs&hl=zh-CN&cites=4750462768145396511&as_sdt=5"
 )
 RESULTS_PER_PAGE = 10
+SCHOLAR_ENTRIES_JS = """
+() => Array.from(document.querySelectorAll('div.gs_r.gs_or.gs_scl')).map((entry) => {
+    const text = (selector) => {
+        const target = entry.querySelector(selector);
+        return target ? target.innerText : null;
+    };
+    const link = entry.querySelector('h3.gs_rt a');
+    return {
+        title: text('h3.gs_rt'),
+        url: link ? link.getAttribute('href') : null,
+        authors_raw: text('.gs_a'),
+        snippet: text('.gs_rs'),
+        cluster_id: entry.getAttribute('data-cid'),
+    };
+})
+"""
 
-ORIGINAL_AUTHORS = {
-    "peter c ma",
-    "pc ma",
-    "p c ma",
-    "yu lv",
-    "y lv",
-    "matthias ihme",
-    "m ihme",
-}
+ORIGINAL_AUTHORS = frozenset(
+    {
+        "peter c ma",
+        "pc ma",
+        "p c ma",
+        "yu lv",
+        "y lv",
+        "matthias ihme",
+        "m ihme",
+    }
+)
 
 DATA_DIR = Path("data")
 REPORTS_DIR = Path("reports")
 RAW_SCHOLAR_JSON = DATA_DIR / "citations_raw.json"
-CROSSREF_CACHE_PATH = DATA_DIR / "crossref_cache.json"
+RAW_SHARDS_DIR = DATA_DIR / "citations_raw"
+CROSSREF_CACHE_PATH = DATA_DIR / "crossref_cache.sqlite"
+LEGACY_CROSSREF_CACHE_PATH = DATA_DIR / "crossref_cache.json"
 CSV_OUTPUT_PATH = DATA_DIR / "citations.csv"
 MARKDOWN_OUTPUT_PATH = REPORTS_DIR / "citations_summary.md"
+OUTPUT_COLUMNS = [
+    "序号",
+    "引用文献标题",
+    "全部作者",
+    "作者-单位对应",
+    "作者单位（汇总）",
+    "发表年份",
+    "来源链接",
+    "DOI",
+    "Crossref期刊",
+    "备注",
+]
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
-REQUESTS_AGENT = (
-    "CitationCollector/0.1 (+https://example.org; mailto:codex-agent@example.com)"
-)
+SCRAPER_CONCURRENCY = 3
+SCRAPER_NAVIGATION_TIMEOUT_MS = 15000
+# Scholar's result text never needs these; skipping them cuts bytes per page load.
+# Stylesheets stay: SCHOLAR_ENTRIES_JS reads innerText, which relies on CSS to
+# hide markers such as the [BOOK]/[B] type spans inside titles.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_URL_MARKERS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
+SCRAPER_PROFILES: List[Dict[str, Any]] = [
+    {"user_agent": USER_AGENT, "viewport": {"width": 1366, "height": 768}},
+    {
+        "user_agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        ),
+        "viewport": {"width": 1440, "height": 900},
+    },
+    {
+        "user_agent": (
+            "Mozilla/5.0 (X11; Linux x86_64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+        ),
+        "viewport": {"width": 1920, "height": 1080},
+    },
+]
+CROSSREF_MAILTO = "codex-agent@example.com"
+# Crossref routes requests to the "polite" pool only when the contact is given
+# as `mailto` or in a `Project/version (mailto:...)` User-Agent.
+REQUESTS_AGENT = f"CitationCollector/0.1 (mailto:{CROSSREF_MAILTO})"
+
+CROSSREF_WORKS_URL = "https://api.crossref.org/works"
+CROSSREF_POLITE_DELAY = 0.1
+CROSSREF_PUBLIC_DELAY = 0.8
+CROSSREF_CONCURRENCY = 8
+CROSSREF_MAX_RETRIES = 5
+CROSSREF_BACKOFF_FACTOR = 1.0
+CROSSREF_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Keep `filter=doi:...` URLs well below server URL length limits (HTTP 414)
+CROSSREF_DOI_BATCH_SIZE = 20
+# Minimum RapidFuzz ratio (0-100) for reusing a cached entry of a different title variant
+CROSSREF_LOCAL_MATCH_SCORE = 90
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.IGNORECASE)
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TITLE_SEPARATOR_PATTERN = re.compile(r"\W+")
+YEAR_PATTERN = re.compile(r"(19|20|21)\d{2}")
 
 
 # Data structures --------------------------------------------------------------
@@ -89,11 +168,21 @@ class EnrichedRecord(ScholarRecord):
     crossref_year: Optional[int] = None
     journal: Optional[str] = None
     crossref_score: Optional[float] = None
+    crossref_match: Optional[str] = None
     crossref_status: str = "unqueried"
     authors_crossref: List[str] = field(default_factory=list)
     authors_crossref_affiliations: List[List[str]] = field(default_factory=list)
     final_authors: List[str] = field(default_factory=list)
     final_author_affiliations: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class CrossrefSession:
+    """HTTP client plus pacing state for one enrichment run."""
+
+    client: httpx.AsyncClient
+    # Pause after each call; drops to the polite-pool rate once Crossref confirms that pool
+    delay: float = CROSSREF_PUBLIC_DELAY
     author_source: str = "unknown"
 
 
@@ -129,45 +218,80 @@ def persist_raw_records(records: List[ScholarRecord]) -> None:
     )
 
 
+def shard_path(year: Optional[int]) -> Path:
+    return RAW_SHARDS_DIR / f"{year or 'fallback'}.json"
+
+
+def persist_year_shard(year: Optional[int], records: List[ScholarRecord]) -> None:
+    RAW_SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    shard_path(year).write_text(
+        json.dumps([asdict(record) for record in records], ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+
+def load_year_shards(years: List[Optional[int]]) -> Dict[Optional[int], List[ScholarRecord]]:
+    """Load the per-year shards written by earlier (possibly interrupted) runs."""
+    shards: Dict[Optional[int], List[ScholarRecord]] = {}
+    for year in years:
+        path = shard_path(year)
+        if not path.exists():
+            continue
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            shards[year] = [ScholarRecord(**item) for item in data]
+        except (json.JSONDecodeError, TypeError):
+            # Corrupt shard: scrape that year again
+            continue
+    return shards
+
+
 def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text.replace("\xa0", " ")).strip()
+    return WHITESPACE_PATTERN.sub(" ", text.replace("\xa0", " ")).strip()
 
 
+@lru_cache(maxsize=65536)
 def normalize_author_name(name: str) -> str:
-    name = name.lower()
-    name = re.sub(r"[^\w\s]", "", name)
-    return normalize_whitespace(name)
+    return WHITESPACE_PATTERN.sub(" ", NON_WORD_PATTERN.sub("", name.lower().replace("\xa0", " "))).strip()
 
 
-def parse_authors(authors_raw: str) -> List[str]:
-    if not authors_raw:
-        return []
-    # Only keep the first section before the first dash to avoid journal info
-    authors_segment = authors_raw.split("-", 1)[0]
-    candidates = [normalize_whitespace(part) for part in authors_segment.split(",")]
-    cleaned = [c for c in candidates if c and c not in {"…", "..."}]
-    return cleaned
+def parse_meta(authors_raw: str) -> Tuple[str, List[str], bool, Optional[int]]:
+    """Split a Scholar ``.gs_a`` line into (raw_meta, authors, truncated, year) in one scan."""
+    raw_meta = normalize_whitespace(authors_raw) if authors_raw else ""
+    if not raw_meta:
+        return "", [], False, None
 
+    truncated = "…" in raw_meta or "..." in raw_meta or "等" in raw_meta
+    match = YEAR_PATTERN.search(raw_meta)
+    year = int(match.group(0)) if match else None
 
-def extract_year(meta: str) -> Optional[int]:
-    if not meta:
-        return None
-    match = re.search(r"(19|20|21)\d{2}", meta)
-    if match:
-        try:
-            return int(match.group(0))
-        except ValueError:
-            return None
-    return None
+    # Only keep the first section before the first dash to avoid journal info
+    authors_segment = raw_meta.split("-", 1)[0]
+    authors_list = [
+        part
+        for part in (candidate.strip() for candidate in authors_segment.split(","))
+        if part and part not in {"…", "..."}
+    ]
+    return raw_meta, authors_list, truncated, year
 
 
 def sequence_score(a: str, b: str) -> float:
-    return SequenceMatcher(None, a, b).ratio()
+    return _rf_ratio(a, b) / 100.0
 
 
+@lru_cache(maxsize=65536)
 def normalize_title(title: str) -> str:
-    cleaned = re.sub(r"[^\w\s]", " ", title.lower())
-    return normalize_whitespace(cleaned)
+    # Punctuation and whitespace runs (NBSP included) collapse to one space in a single pass
+    return TITLE_SEPARATOR_PATTERN.sub(" ", title.lower()).strip()
+
+
+def extract_doi(url: Optional[str]) -> Optional[str]:
+    if not url:
+        return None
+    match = DOI_PATTERN.search(url)
+    if match:
+        return match.group(0).rstrip(".").lower()
+    return None
 
 
 def record_key(record: ScholarRecord) -> str:
@@ -176,27 +300,34 @@ def record_key(record: ScholarRecord) -> str:
     return f"title:{normalize_title(record.title)}"
 
 
-async def get_element_text(handle: ElementHandle, selector: str) -> Optional[str]:
-    target = await handle.query_selector(selector)
-    if target is None:
-        return None
-    return await target.inner_text()
-
+# Scholar scraping -------------------------------------------------------------
 
-async def get_element_href(handle: ElementHandle, selector: str) -> Optional[str]:
-    target = await handle.query_selector(selector)
-    if target is None:
-        return None
-    return await target.get_attribute("href")
 
+async def block_nonessential_requests(route: Route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        marker in request.url for marker in BLOCKED_URL_MARKERS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
 
-# Scholar scraping -------------------------------------------------------------
 
+async def fetch_page_entries(
+    page: Page,
+    base_url: str,
+    start: int,
+    seen: set[str],
+) -> Tuple[List[ScholarRecord], List[str], Optional[int]]:
+    """Fetch one result page.
 
-async def fetch_page_entries(page: Page, base_url: str, start: int) -> Tuple[List[ScholarRecord], Optional[int]]:
+    Returns the records not already in ``seen``, the keys of every entry on the
+    page (its raw count, used by the caller to detect the end of the listing)
+    and the total result count shown on the first page.
+    """
     target_url = f"{base_url}&start={start}"
     await page.goto(target_url, wait_until="domcontentloaded")
-    await page.wait_for_timeout(random.randint(2000, 3500))
+    await asyncio.sleep(random.randint(2000, 3500) / 1000)
 
     # Extract total results (only available on the first page)
     total_results: Optional[int] = None
@@ -212,27 +343,23 @@ async def fetch_page_entries(page: Page, base_url: str, start: int) -> Tuple[Lis
         except Exception:
             total_results = None
 
-    entry_handles = await page.query_selector_all("div.gs_r.gs_or.gs_scl")
+    # Extract every entry in a single round-trip to the browser
+    entries: List[Dict[str, Optional[str]]] = await page.evaluate(SCHOLAR_ENTRIES_JS)
     records: List[ScholarRecord] = []
+    page_keys: List[str] = []
 
-    for index, handle in enumerate(entry_handles):
+    for entry in entries:
         try:
-            title = await get_element_text(handle, "h3.gs_rt")
+            title = entry.get("title")
             if not title:
                 continue
             title = normalize_whitespace(title)
-            url = await get_element_href(handle, "h3.gs_rt a")
-            authors_raw = await get_element_text(handle, ".gs_a")
-            snippet = await get_element_text(handle, ".gs_rs")
-            cluster_id = await handle.get_attribute("data-cid")
-
-            raw_meta = normalize_whitespace(authors_raw or "")
-            truncated = False
-            if authors_raw:
-                raw_lower = authors_raw.lower()
-                truncated = any(marker in authors_raw for marker in ["…", "..."]) or ("等" in raw_lower)
-            year = extract_year(raw_meta)
-            authors_list = parse_authors(authors_raw or "")
+            url = entry.get("url")
+            authors_raw = entry.get("authors_raw")
+            snippet = entry.get("snippet")
+            cluster_id = entry.get("cluster_id")
+
+            raw_meta, authors_list, truncated, year = parse_meta(authors_raw or "")
 
             record = ScholarRecord(
                 title=title,
@@ -246,51 +373,103 @@ async def fetch_page_entries(page: Page, base_url: str, start: int) -> Tuple[Lis
                 authors_list=authors_list,
                 authors_truncated=truncated,
             )
+            key = record_key(record)
+            page_keys.append(key)
+            if key in seen:
+                continue
+            seen.add(key)
             records.append(record)
         except Exception:
             continue
 
-    return records, total_results
-
-
-async def scrape_years(years: List[Optional[int]]) -> Dict[Optional[int], List[ScholarRecord]]:
+    return records, page_keys, total_results
+
+
+async def scrape_one_year(
+    page: Page,
+    year: Optional[int],
+    seen: set[str],
+) -> Tuple[List[ScholarRecord], bool]:
+    """Scrape every result page of one query.
+
+    Returns the records not already in ``seen`` and whether the listing was
+    read to the end: every advertised result was paged through, or
+    pagination wrapped around. An empty page before that point (a CAPTCHA
+    or a blocked request) leaves the query incomplete.
+    """
+    base_url = BASE_CITATION_URL
+    if year is not None:
+        base_url = f"{base_url}&as_ylo={year}&as_yhi={year}"
+
+    collected: List[ScholarRecord] = []
+    query_keys: set[str] = set()
+    start = 0
+    total_expected: Optional[int] = None
+    complete = False
+
+    while True:
+        records, page_keys, total_results = await fetch_page_entries(page, base_url, start, seen)
+        if total_expected is None and total_results:
+            total_expected = total_results
+
+        # Stop on an empty page, or one repeating only entries this query already
+        # listed (pagination wrapped around). The shared ``seen`` set only filters
+        # what is collected: other queries finding the same records first must
+        # not cut this listing short.
+        if not page_keys:
+            break
+        if query_keys.issuperset(page_keys):
+            complete = True
+            break
+        query_keys.update(page_keys)
+
+        collected.extend(records)
+        start += RESULTS_PER_PAGE
+
+        if total_expected is not None and start >= total_expected:
+            complete = True
+            break
+
+        await asyncio.sleep(random.randint(4000, 6500) / 1000)
+
+    return collected, complete
+
+
+async def scrape_years(
+    years: List[Optional[int]],
+    seen: Optional[set[str]] = None,
+) -> Dict[Optional[int], List[ScholarRecord]]:
     ensure_directories()
     results: Dict[Optional[int], List[ScholarRecord]] = {}
+    # Shared across all slots so repeats between year and fallback queries are dropped at scrape time
+    if seen is None:
+        seen = set()
 
     async with async_playwright() as playwright:
         browser = await playwright.chromium.launch(headless=True)
-        context = await browser.new_context(user_agent=USER_AGENT)
-        page = await context.new_page()
-
-        await page.wait_for_timeout(random.randint(2000, 4000))
-
-        for year in years:
-            base_url = BASE_CITATION_URL
-            if year is not None:
-                base_url = f"{base_url}&as_ylo={year}&as_yhi={year}"
 
-            collected: List[ScholarRecord] = []
-            start = 0
-            total_expected: Optional[int] = None
-
-            while True:
-                records, total_results = await fetch_page_entries(page, base_url, start)
-                if total_expected is None and total_results:
-                    total_expected = total_results
-
-                if not records:
-                    break
-
-                collected.extend(records)
-                start += RESULTS_PER_PAGE
-
-                if total_expected is not None and start >= total_expected:
-                    break
-
-                await page.wait_for_timeout(random.randint(4000, 6500))
-
-            results[year] = collected
-            await page.wait_for_timeout(random.randint(4500, 7000))
+        # One context (and page) per concurrent slot, each with its own fingerprint
+        pages: asyncio.Queue[Page] = asyncio.Queue()
+        for profile in SCRAPER_PROFILES[:SCRAPER_CONCURRENCY]:
+            context = await browser.new_context(**profile)
+            await context.route("**/*", block_nonessential_requests)
+            page = await context.new_page()
+            page.set_default_navigation_timeout(SCRAPER_NAVIGATION_TIMEOUT_MS)
+            await asyncio.sleep(random.randint(2000, 4000) / 1000)
+            pages.put_nowait(page)
+
+        async def scrape_with_slot(year: Optional[int]) -> None:
+            page = await pages.get()
+            try:
+                results[year], complete = await scrape_one_year(page, year, seen)
+                # A listing cut short (CAPTCHA, blocked page) stays unsharded so the next run retries it
+                if complete:
+                    persist_year_shard(year, results[year])
+                await asyncio.sleep(random.randint(4500, 7000) / 1000)
+            finally:
+                pages.put_nowait(page)
+
+        await asyncio.gather(*[scrape_with_slot(year) for year in years])
 
         await browser.close()
 
@@ -300,69 +479,66 @@ async def scrape_years(years: List[Optional[int]]) -> Dict[Optional[int], List[S
 # Crossref enrichment ----------------------------------------------------------
 
 
-def load_crossref_cache() -> Dict[str, Dict[str, Any]]:
-    if CROSSREF_CACHE_PATH.exists():
-        try:
-            data = json.loads(CROSSREF_CACHE_PATH.read_text(encoding="utf-8"))
-            if isinstance(data, dict):
-                return data
-        except json.JSONDecodeError:
-            return {}
-    return {}
-
-
-def save_crossref_cache(cache: Dict[str, Dict[str, Any]]) -> None:
-    CROSSREF_CACHE_PATH.write_text(
-        json.dumps(cache, ensure_ascii=False, indent=2),
-        encoding="utf-8",
+def open_crossref_cache() -> sqlite3.Connection:
+    conn = sqlite3.connect(CROSSREF_CACHE_PATH, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS crossref ("
+        "norm_title TEXT PRIMARY KEY, payload BLOB, fetched_at INTEGER)"
     )
+    migrate_legacy_crossref_cache(conn)
+    return conn
 
 
-def query_crossref(title: str, session: requests.Session, cache: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
-    norm_title = normalize_title(title)
-    if norm_title in cache:
-        return cache[norm_title]
+def migrate_legacy_crossref_cache(conn: sqlite3.Connection) -> None:
+    """Import the old whole-file JSON cache into an empty SQLite cache."""
+    if not LEGACY_CROSSREF_CACHE_PATH.exists():
+        return
+    if conn.execute("SELECT 1 FROM crossref LIMIT 1").fetchone():
+        return
+    try:
+        data = json.loads(LEGACY_CROSSREF_CACHE_PATH.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return
+    if not isinstance(data, dict):
+        return
+    fetched_at = int(LEGACY_CROSSREF_CACHE_PATH.stat().st_mtime)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO crossref (norm_title, payload, fetched_at) VALUES (?, ?, ?)",
+            [
+                (key, json.dumps(value, ensure_ascii=False).encode("utf-8"), fetched_at)
+                for key, value in data.items()
+            ],
+        )
+
+
+def crossref_cache_get(conn: sqlite3.Connection, key: str) -> Optional[Dict[str, Any]]:
+    row = conn.execute("SELECT payload FROM crossref WHERE norm_title = ?", (key,)).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0])
 
-    params = {
-        "query.bibliographic": title,
-        "rows": 5,
-    }
-    headers = {
-        "User-Agent": REQUESTS_AGENT,
-    }
 
-    try:
-        response = session.get("https://api.crossref.org/works", params=params, headers=headers, timeout=30)
-        response.raise_for_status()
-        items = response.json().get("message", {}).get("items", [])
-    except Exception as exc:
-        cache[norm_title] = {
-            "status": "error",
-            "error": str(exc),
-        }
-        return cache[norm_title]
+def crossref_cached_titles(conn: sqlite3.Connection) -> List[str]:
+    """Normalized titles of successfully matched cache entries (DOI keys excluded)."""
+    # Payloads are stored as UTF-8 BLOBs, which SQLite's JSON functions only accept as TEXT
+    rows = conn.execute(
+        "SELECT norm_title FROM crossref WHERE norm_title NOT LIKE 'doi:%' "
+        "AND json_extract(CAST(payload AS TEXT), '$.status') = 'ok'"
+    )
+    return [key for (key,) in rows]
 
-    best_item: Optional[Dict[str, Any]] = None
-    best_score = 0.0
 
-    for item in items:
-        title_list = item.get("title") or []
-        if not title_list:
-            continue
-        item_title = title_list[0]
-        score = sequence_score(normalize_title(item_title), norm_title)
-        if score > best_score:
-            best_score = score
-            best_item = item
+def crossref_cache_put(conn: sqlite3.Connection, key: str, result: Dict[str, Any]) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO crossref (norm_title, payload, fetched_at) VALUES (?, ?, ?)",
+        (key, json.dumps(result, ensure_ascii=False).encode("utf-8"), int(time.time())),
+    )
 
-    if best_item is None or best_score < 0.6:
-        cache[norm_title] = {
-            "status": "no_match",
-            "score": best_score,
-        }
-        return cache[norm_title]
 
-    authors = best_item.get("author", []) or []
+def build_crossref_result(item: Dict[str, Any], score: float, match: str = "title") -> Dict[str, Any]:
+    authors = item.get("author", []) or []
     authors_full: List[str] = []
     authors_affiliations: List[List[str]] = []
     first_author = None
@@ -390,85 +566,303 @@ def query_crossref(title: str, session: requests.Session, cache: Dict[str, Dict[
             first_author = name if name != "信息缺失" else None
             first_affiliations = aff_list
 
-    issued = best_item.get("issued", {}).get("date-parts", [])
+    issued = item.get("issued", {}).get("date-parts", [])
     crossref_year = issued[0][0] if issued and issued[0] else None
 
-    result = {
+    return {
         "status": "ok",
-        "score": best_score,
-        "doi": best_item.get("DOI"),
-        "journal": (best_item.get("container-title") or [None])[0],
+        "match": match,
+        "score": score,
+        "doi": item.get("DOI"),
+        "journal": (item.get("container-title") or [None])[0],
         "year": crossref_year,
         "first_author": first_author,
         "first_affiliations": first_affiliations,
         "authors": authors_full,
         "authors_affiliations": authors_affiliations,
     }
-    cache[norm_title] = result
-    return result
 
 
-def enrich_records(records: List[ScholarRecord]) -> List[EnrichedRecord]:
-    session = requests.Session()
-    cache = load_crossref_cache()
-    enriched: List[EnrichedRecord] = []
-
-    for idx, record in enumerate(records, start=1):
-        info = query_crossref(record.title, session, cache)
-        enriched_record = EnrichedRecord(**asdict(record))
-        enriched_record.crossref_status = info.get("status", "unknown")
-        enriched_record.crossref_score = info.get("score")
-        enriched_record.doi = info.get("doi")
-        enriched_record.journal = info.get("journal")
-        enriched_record.crossref_year = info.get("year")
-
-        crossref_authors = info.get("authors") or []
-        crossref_affiliations = info.get("authors_affiliations") or [[] for _ in crossref_authors]
-        if crossref_affiliations and len(crossref_affiliations) != len(crossref_authors):
-            # Align lengths defensively
-            crossref_affiliations = crossref_affiliations[: len(crossref_authors)]
-            while len(crossref_affiliations) < len(crossref_authors):
-                crossref_affiliations.append([])
-
-        enriched_record.authors_crossref = crossref_authors
-        enriched_record.authors_crossref_affiliations = crossref_affiliations
-
-        final_authors: List[str] = []
-        final_affiliations: List[List[str]] = []
-
-        if crossref_authors:
-            final_authors = crossref_authors
-            final_affiliations = crossref_affiliations
-            enriched_record.author_source = "crossref"
-        elif record.authors_list:
-            final_authors = record.authors_list
-            final_affiliations = [[] for _ in final_authors]
-            enriched_record.author_source = "scholar_truncated" if record.authors_truncated else "scholar"
+def crossref_title_score(item: Dict[str, Any], norm_title: str) -> float:
+    title_list = item.get("title") or []
+    if not title_list:
+        return 0.0
+    return sequence_score(normalize_title(title_list[0]), norm_title)
+
+
+async def crossref_get(
+    session: CrossrefSession,
+    params: Dict[str, Any],
+    url: str = CROSSREF_WORKS_URL,
+) -> Dict[str, Any]:
+    """GET a Crossref works endpoint and return the ``message`` payload.
+
+    The delay after each call drops to the polite-pool rate once Crossref
+    confirms the request was served from that pool (``x-api-pool: polite``).
+    Throttling (429), 5xx responses and connection failures are retried with
+    exponential backoff, honouring ``Retry-After`` when present.
+    """
+    params = {**params, "mailto": CROSSREF_MAILTO}
+    attempt = 0
+    try:
+        while True:
+            backoff = CROSSREF_BACKOFF_FACTOR * (2 ** attempt)
+            try:
+                response = await session.client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt >= CROSSREF_MAX_RETRIES:
+                    raise
+            else:
+                pool = response.headers.get("x-api-pool", "").lower()
+                session.delay = CROSSREF_POLITE_DELAY if pool == "polite" else CROSSREF_PUBLIC_DELAY
+                if response.status_code not in CROSSREF_RETRY_STATUSES or attempt >= CROSSREF_MAX_RETRIES:
+                    response.raise_for_status()
+                    return response.json().get("message", {})
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    backoff = float(retry_after)
+            await asyncio.sleep(backoff)
+            attempt += 1
+    finally:
+        # Respectful delay to avoid hitting Crossref rate limits
+        await asyncio.sleep(session.delay)
+
+
+async def query_crossref(
+    session: CrossrefSession,
+    title: str,
+    cache: sqlite3.Connection,
+) -> Dict[str, Any]:
+    norm_title = normalize_title(title)
+    cached = crossref_cache_get(cache, norm_title)
+    # Errors cached by older runs (e.g. imported from the legacy JSON cache) are retried
+    if cached is not None and cached.get("status") != "error":
+        return cached
+
+    params = {
+        "query.bibliographic": title,
+        "rows": 5,
+    }
+
+    try:
+        items = (await crossref_get(session, params)).get("items", [])
+    except Exception as exc:
+        return {
+            "status": "error",
+            "error": str(exc),
+        }
+
+    best_item: Optional[Dict[str, Any]] = None
+    best_score = 0.0
+
+    for item in items:
+        score = crossref_title_score(item, norm_title)
+        if score > best_score:
+            best_score = score
+            best_item = item
+
+    if best_item is None or best_score < 0.6:
+        return {
+            "status": "no_match",
+            "score": best_score,
+        }
+
+    return build_crossref_result(best_item, best_score)
+
+
+async def query_crossref_dois(
+    session: CrossrefSession,
+    batch: List[Tuple[ScholarRecord, str]],
+) -> Tuple[Dict[str, Dict[str, Any]], List[ScholarRecord]]:
+    """Resolve records with a known DOI without a fuzzy title search.
+
+    A single DOI is fetched from ``/works/{doi}``; larger batches use one
+    ``filter=doi:`` query. Returns the results keyed by both the normalized
+    title and ``doi:<doi>``, plus the records whose DOI was not found so they
+    can fall back to a bibliographic title search.
+    """
+    try:
+        if len(batch) == 1:
+            doi = batch[0][1]
+            items = [await crossref_get(session, {}, url=f"{CROSSREF_WORKS_URL}/{quote(doi, safe='/')}")]
         else:
-            final_authors = []
-            final_affiliations = []
-            enriched_record.author_source = "unknown"
+            params = {
+                "filter": ",".join(f"doi:{doi}" for _, doi in batch),
+                "rows": len(batch),
+            }
+            items = (await crossref_get(session, params)).get("items", [])
+    except Exception:
+        return {}, [record for record, _ in batch]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    unresolved: List[ScholarRecord] = []
+    items_by_doi = {(item.get("DOI") or "").lower(): item for item in items}
+    for record, doi in batch:
+        item = items_by_doi.get(doi)
+        if item is None:
+            unresolved.append(record)
+            continue
+        norm_title = normalize_title(record.title)
+        # An exact DOI hit is certain; the title similarity says nothing about it
+        result = build_crossref_result(item, 1.0, match="doi")
+        results[norm_title] = result
+        results[f"doi:{doi}"] = result
+
+    return results, unresolved
+
+
+def build_enriched_record(record: ScholarRecord, info: Dict[str, Any]) -> EnrichedRecord:
+    enriched_record = EnrichedRecord(**asdict(record))
+    enriched_record.crossref_status = info.get("status", "unknown")
+    enriched_record.crossref_score = info.get("score")
+    enriched_record.crossref_match = info.get("match")
+    enriched_record.doi = info.get("doi")
+    enriched_record.journal = info.get("journal")
+    enriched_record.crossref_year = info.get("year")
+
+    crossref_authors = info.get("authors") or []
+    crossref_affiliations = info.get("authors_affiliations") or [[] for _ in crossref_authors]
+    if crossref_affiliations and len(crossref_affiliations) != len(crossref_authors):
+        # Align lengths defensively
+        crossref_affiliations = crossref_affiliations[: len(crossref_authors)]
+        while len(crossref_affiliations) < len(crossref_authors):
+            crossref_affiliations.append([])
+
+    enriched_record.authors_crossref = crossref_authors
+    enriched_record.authors_crossref_affiliations = crossref_affiliations
+
+    final_authors: List[str] = []
+    final_affiliations: List[List[str]] = []
+
+    if crossref_authors:
+        final_authors = crossref_authors
+        final_affiliations = crossref_affiliations
+        enriched_record.author_source = "crossref"
+    elif record.authors_list:
+        final_authors = record.authors_list
+        final_affiliations = [[] for _ in final_authors]
+        enriched_record.author_source = "scholar_truncated" if record.authors_truncated else "scholar"
+    else:
+        final_authors = []
+        final_affiliations = []
+        enriched_record.author_source = "unknown"
 
-        enriched_record.final_authors = final_authors
-        enriched_record.final_author_affiliations = final_affiliations
+    enriched_record.final_authors = final_authors
+    enriched_record.final_author_affiliations = final_affiliations
 
-        if final_authors:
-            enriched_record.first_author = final_authors[0]
-            if final_affiliations:
-                enriched_record.first_author_affiliations = final_affiliations[0]
+    if final_authors:
+        enriched_record.first_author = final_authors[0]
+        if final_affiliations:
+            enriched_record.first_author_affiliations = final_affiliations[0]
 
-        if enriched_record.crossref_year is None:
-            enriched_record.crossref_year = record.year
+    if enriched_record.crossref_year is None:
+        enriched_record.crossref_year = record.year
 
-        enriched.append(enriched_record)
+    return enriched_record
 
-        # Respectful delay to avoid hitting Crossref rate limits
-        time.sleep(0.8)
 
-    save_crossref_cache(cache)
+async def enrich_records_async(records: List[ScholarRecord]) -> List[EnrichedRecord]:
+    cache = open_crossref_cache()
+    cache_lock = asyncio.Lock()
+    semaphore = asyncio.Semaphore(CROSSREF_CONCURRENCY)
+    errors: Dict[str, Dict[str, Any]] = {}
+
+    # Only query each uncached title once
+    pending: Dict[str, ScholarRecord] = {}
+    for record in records:
+        norm_title = normalize_title(record.title)
+        if norm_title in pending:
+            continue
+        cached = crossref_cache_get(cache, norm_title)
+        # Errors cached by older runs are treated as misses and retried
+        if cached is None or cached.get("status") == "error":
+            pending[norm_title] = record
+
+    doi_records: List[Tuple[ScholarRecord, str]] = []
+    title_records: List[ScholarRecord] = []
+    for norm_title, record in pending.items():
+        doi = extract_doi(record.url)
+        if doi:
+            cached = crossref_cache_get(cache, f"doi:{doi}")
+            if cached is not None:
+                crossref_cache_put(cache, norm_title, cached)
+            else:
+                doi_records.append((record, doi))
+        else:
+            title_records.append(record)
+
+    # Second chance before the network: a cached entry for a near-identical title
+    known_titles = crossref_cached_titles(cache) if title_records else []
+    if known_titles:
+        unmatched: List[ScholarRecord] = []
+        for record in title_records:
+            norm_title = normalize_title(record.title)
+            match = rf_process.extractOne(
+                norm_title,
+                known_titles,
+                scorer=_rf_ratio,
+                processor=None,
+                score_cutoff=CROSSREF_LOCAL_MATCH_SCORE,
+            )
+            if match is None:
+                unmatched.append(record)
+                continue
+            crossref_cache_put(cache, norm_title, crossref_cache_get(cache, match[0]))
+        title_records = unmatched
+
+    async def bounded_doi_batch(batch: List[Tuple[ScholarRecord, str]]) -> List[ScholarRecord]:
+        async with semaphore:
+            results, unresolved = await query_crossref_dois(session, batch)
+        async with cache_lock:
+            for key, result in results.items():
+                crossref_cache_put(cache, key, result)
+        return unresolved
+
+    async def bounded_title(record: ScholarRecord) -> None:
+        async with semaphore:
+            result = await query_crossref(session, record.title, cache)
+        norm_title = normalize_title(record.title)
+        if result.get("status") == "error":
+            # Transient failures are not cached so the next run retries them
+            errors[norm_title] = result
+            return
+        async with cache_lock:
+            crossref_cache_put(cache, norm_title, result)
+            # Also key successful matches by DOI so other title variants resolve locally
+            if result.get("status") == "ok" and result.get("doi"):
+                crossref_cache_put(cache, f"doi:{result['doi'].lower()}", result)
+
+    # HTTP/2 multiplexes the concurrent lookups over a single TLS connection
+    client = httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        headers={"User-Agent": REQUESTS_AGENT},
+        limits=httpx.Limits(max_connections=CROSSREF_CONCURRENCY),
+    )
+    async with client:
+        session = CrossrefSession(client)
+        batches = [
+            doi_records[offset : offset + CROSSREF_DOI_BATCH_SIZE]
+            for offset in range(0, len(doi_records), CROSSREF_DOI_BATCH_SIZE)
+        ]
+        for unresolved in await asyncio.gather(*[bounded_doi_batch(batch) for batch in batches]):
+            title_records.extend(unresolved)
+
+        await asyncio.gather(*[bounded_title(record) for record in title_records])
+
+    enriched = []
+    for record in records:
+        norm_title = normalize_title(record.title)
+        info = errors.get(norm_title) or crossref_cache_get(cache, norm_title) or {}
+        enriched.append(build_enriched_record(record, info))
+    cache.close()
     return enriched
 
 
+def enrich_records(records: List[ScholarRecord]) -> List[EnrichedRecord]:
+    return asyncio.run(enrich_records_async(records))
+
+
 # Filtering and output ---------------------------------------------------------
 
 
@@ -476,8 +870,7 @@ def filter_self_citations(records: List[EnrichedRecord]) -> List[EnrichedRecord]
     filtered: List[EnrichedRecord] = []
     for record in records:
         author_names = record.final_authors or record.authors_list
-        normalized = {normalize_author_name(author) for author in author_names if author}
-        if normalized.intersection(ORIGINAL_AUTHORS):
+        if any(normalize_author_name(author) in ORIGINAL_AUTHORS for author in author_names if author):
             continue
         filtered.append(record)
     return filtered
@@ -512,7 +905,9 @@ def record_to_output_row(index: int, record: EnrichedRecord) -> Dict[str, Any]:
     notes = []
     if record.crossref_status != "ok":
         notes.append(f"crossref_status={record.crossref_status}")
-    if record.crossref_score is not None:
+    if record.crossref_match == "doi":
+        notes.append("match=doi")
+    elif record.crossref_score is not None:
         notes.append(f"score={record.crossref_score:.2f}")
     if not record.final_authors:
         notes.append("missing_authors")
@@ -537,42 +932,32 @@ def record_to_output_row(index: int, record: EnrichedRecord) -> Dict[str, Any]:
 
 
 def build_markdown_summary(
-    df: pd.DataFrame,
+    rows: List[Dict[str, Any]],
     total_records: int,
     filtered_records: int,
 ) -> str:
     affiliation_column = "作者单位（汇总）"
-    total_unique_affiliations = (
-        df[affiliation_column]
-        .loc[df[affiliation_column] != "信息缺失"]
-        .str.split("; ")
-        .explode()
-        .str.strip()
-        .replace("", pd.NA)
-        .dropna()
-        .nunique()
-    )
-
-    top_affiliations = (
-        df[affiliation_column]
-        .loc[df[affiliation_column] != "信息缺失"]
-        .str.split("; ")
-        .explode()
-        .str.strip()
-        .replace("", pd.NA)
-        .dropna()
-        .value_counts()
-        .head(10)
+    summaries = [row[affiliation_column] for row in rows]
+    missing_affiliation_count = summaries.count("信息缺失")
+    # One update() call over a flat stream replaces the per-item `counts[aff] += 1` lookups
+    affiliation_counts: Counter[str] = Counter()
+    affiliation_counts.update(
+        affiliation
+        for summary in summaries
+        if summary != "信息缺失"
+        for affiliation in map(str.strip, summary.split("; "))
+        if affiliation
     )
 
-    missing_affiliation_count = (df[affiliation_column] == "信息缺失").sum()
+    total_unique_affiliations = len(affiliation_counts)
+    top_affiliations = affiliation_counts.most_common(10)
 
     lines = [
         "# 引用统计概览",
         "",
         f"- Google Scholar 总引用记录：{total_records}",
         f"- 排除原作者后的引用记录：{filtered_records}",
-        f"- 生成数据表条目：{len(df)}",
+        f"- 生成数据表条目：{len(rows)}",
         f"- 有效作者单位数量：{total_unique_affiliations}",
         f"- 作者单位缺失条目：{missing_affiliation_count}",
         "",
@@ -580,12 +965,12 @@ def build_markdown_summary(
         "",
     ]
 
-    if top_affiliations.empty:
+    if not top_affiliations:
         lines.append("暂无足够的单位信息可供统计。")
     else:
         lines.append("| 序号 | 单位 | 计数 |")
         lines.append("| --- | --- | --- |")
-        for idx, (affiliation, count) in enumerate(top_affiliations.items(), start=1):
+        for idx, (affiliation, count) in enumerate(top_affiliations, start=1):
             lines.append(f"| {idx} | {affiliation} | {count} |")
 
     lines.extend(
@@ -594,7 +979,7 @@ def build_markdown_summary(
             "## 数据说明",
             "",
             "- 若 Crossref 未找到匹配条目或缺失机构信息，则以“信息缺失”标注。",
-            "- Crossref 匹配置信度以 SequenceMatcher 得到的相似度衡量，详见 CSV 中的备注列。",
+            "- Crossref 匹配置信度以 RapidFuzz ratio 得到的相似度衡量，详见 CSV 中的备注列。",
             "- “作者-单位对应” 列使用 `|` 分隔各作者，括号内列出其全部可识别的单位；若无单位信息则标记为“信息缺失”。",
         ]
     )
@@ -605,40 +990,32 @@ def build_markdown_summary(
 # Main orchestration -----------------------------------------------------------
 
 
-def main() -> None:
+def main(force: bool = False) -> None:
     ensure_directories()
     current_year = datetime.date.today().year
     years = list(range(2016, current_year + 1))
     scrape_targets: List[Optional[int]] = years + [None]
 
-    scraped_by_year = asyncio.run(scrape_years(scrape_targets))
-
+    # Reuse shards of finished past years; the current year and the open-ended
+    # fallback query keep gaining citations, so they are always scraped again
+    closed_years: List[Optional[int]] = [year for year in years if year != current_year]
+    scraped_by_year = {} if force else load_year_shards(closed_years)
+    # Stored keys only filter duplicates out of the remaining queries; they never end a query's pagination
+    seen = {record_key(record) for records in scraped_by_year.values() for record in records}
+    remaining = [year for year in scrape_targets if year not in scraped_by_year]
+    if remaining:
+        scraped_by_year.update(asyncio.run(scrape_years(remaining, seen)))
+
+    # Records are already deduplicated across queries by scrape_years
     combined_records: List[ScholarRecord] = []
-    seen_keys: set[str] = set()
-
-    def record_key(record: ScholarRecord) -> str:
-        if record.cluster_id:
-            return f"cluster:{record.cluster_id}"
-        return f"title:{normalize_title(record.title)}"
-
     for year in years:
         yearly_records = scraped_by_year.get(year, [])
         print(f"Fetched {len(yearly_records)} records for {year}")
-        for record in yearly_records:
-            key = record_key(record)
-            if key in seen_keys:
-                continue
-            combined_records.append(record)
-            seen_keys.add(key)
+        combined_records.extend(yearly_records)
 
     fallback_records = scraped_by_year.get(None, [])
     print(f"Fetched {len(fallback_records)} records for fallback query")
-    for record in fallback_records:
-        key = record_key(record)
-        if key in seen_keys:
-            continue
-        combined_records.append(record)
-        seen_keys.add(key)
+    combined_records.extend(fallback_records)
 
     RAW_SCHOLAR_JSON.write_text(
         json.dumps([asdict(record) for record in combined_records], ensure_ascii=False, indent=2),
@@ -653,11 +1030,13 @@ def main() -> None:
         for idx, record in enumerate(filtered_records, start=1)
     ]
 
-    df = pd.DataFrame(output_rows)
-    df.to_csv(CSV_OUTPUT_PATH, index=False, encoding="utf-8-sig")
+    with CSV_OUTPUT_PATH.open("w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.DictWriter(handle, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(output_rows)
 
     summary_md = build_markdown_summary(
-        df,
+        output_rows,
         total_records=len(combined_records),
         filtered_records=len(filtered_records),
     )
@@ -665,4 +1044,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Collect citations via Google Scholar and Crossref.")
+    parser.add_argument("--force", action="store_true", help="忽略已保存的分年度结果，重新抓取全部年份。")
+    args = parser.parse_args()
+    main(force=args.force)
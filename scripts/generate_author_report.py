@@ -1,19 +1,30 @@
 from __future__ import annotations
 
 import datetime as dt
-import html
+import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
+from citation_table import load_dataframe
+from report_html import escape_html, load_report_template
+
 DATA_DIR = Path("data")
 REPORTS_DIR = Path("reports")
 CSV_PATH = DATA_DIR / "citations.csv"
+PARQUET_PATH = DATA_DIR / "citations.parquet"
 OUTPUT_PATH = REPORTS_DIR / "openalex_authors_report.html"
 
 MISSING_VALUE = "信息缺失"
+# One `|`-separated part: `Name (Aff1; Aff2)` when the part holds both brackets, else a bare name
+AUTHOR_AFFILIATION_PATTERN = re.compile(
+    r"(?:(?=[^|]*\))(?P<name>[^|(]*)\((?P<affiliations>[^)|]*)\)?[^|]*|(?P<bare>[^|]*))(?:\||$)"
+)
+# Loaded once; the ${authors_html} list between head and tail is streamed by write_html
+REPORT_HEAD, REPORT_TAIL = load_report_template("author_report.html", "authors_html")
 
 
 def normalize_text(value: str) -> str:
@@ -28,16 +39,15 @@ def parse_author_affiliations(author_aff_map: str) -> Dict[str, Set[str]]:
     if not isinstance(author_aff_map, str) or not author_aff_map:
         return mapping
 
-    parts = [part.strip() for part in author_aff_map.split("|") if part.strip()]
-    for part in parts:
-        if "(" in part and ")" in part:
-            name_part, _, rest = part.partition("(")
-            affiliations_part, _, _ = rest.partition(")")
-            name = name_part.strip()
-            affiliations = [aff.strip() for aff in affiliations_part.split(";") if aff.strip()]
-        else:
-            name = part.strip()
+    # One regex walk yields (name, affiliations) for every `Name (Aff1; Aff2)` part
+    for match in AUTHOR_AFFILIATION_PATTERN.finditer(author_aff_map):
+        affiliations_part = match.group("affiliations")
+        if affiliations_part is None:
+            name = match.group("bare").strip()
             affiliations = []
+        else:
+            name = match.group("name").strip()
+            affiliations = [aff.strip() for aff in affiliations_part.split(";") if aff.strip()]
 
         if not name:
             continue
@@ -57,12 +67,13 @@ def parse_authors_list(authors: str) -> List[str]:
 def build_author_index(df: pd.DataFrame) -> Dict[str, Dict[str, object]]:
     author_data: Dict[str, Dict[str, object]] = {}
 
-    for _, row in df.iterrows():
-        authors = parse_authors_list(row["authors"])
-        mapping = parse_author_affiliations(row["author_aff_map"])
-        title = str(row["title"]).strip()
-        year = row["year"]
-        year_display = str(year) if pd.notna(year) else MISSING_VALUE
+    columns = df[["authors", "author_aff_map", "title"]].to_numpy(copy=False)
+    year_displays = np.where(df["year"].notna(), df["year"].astype(str), MISSING_VALUE)
+
+    for (authors_field, aff_map, title_value), year_display in zip(columns, year_displays):
+        authors = parse_authors_list(authors_field)
+        mapping = parse_author_affiliations(aff_map)
+        title = str(title_value).strip()
 
         for author in authors:
             if author not in author_data:
@@ -81,17 +92,9 @@ def build_author_index(df: pd.DataFrame) -> Dict[str, Dict[str, object]]:
     return author_data
 
 
-def build_html(author_index: Dict[str, Dict[str, object]]) -> str:
-    generated_ts = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    total_authors = len(author_index)
-
-    # sort authors by number of articles desc then name
-    sorted_authors = sorted(
-        author_index.items(),
-        key=lambda item: (-len(item[1]["articles"]), item[0].lower()),
-    )
-
-    author_sections: List[str] = []
+def iter_author_sections(
+    sorted_authors: List[Tuple[str, Dict[str, object]]],
+) -> Iterator[str]:
     for idx, (author, data) in enumerate(sorted_authors, start=1):
         affiliations = data["affiliations"]
         articles = data["articles"]
@@ -101,14 +104,14 @@ def build_html(author_index: Dict[str, Dict[str, object]]) -> str:
         )
 
         articles_rows = "\n".join(
-            f"<tr><td>{i}</td><td>{html.escape(title)}</td><td>{html.escape(str(year))}</td></tr>"
+            f"<tr><td>{i}</td><td>{escape_html(title)}</td><td>{escape_html(str(year))}</td></tr>"
             for i, (title, year) in enumerate(articles, start=1)
         )
 
         section_html = f"""
         <div class="author-block">
-            <h3>{idx}. {html.escape(author)}</h3>
-            <p><strong>作者单位：</strong>{html.escape(affiliations_text)}</p>
+            <h3>{idx}. {escape_html(author)}</h3>
+            <p><strong>作者单位：</strong>{escape_html(affiliations_text)}</p>
             <table>
                 <thead>
                     <tr><th>#</th><th>文章题目</th><th>年份</th></tr>
@@ -119,116 +122,37 @@ def build_html(author_index: Dict[str, Dict[str, object]]) -> str:
             </table>
         </div>
         """
-        author_sections.append(section_html)
-
-    authors_html = "\n".join(author_sections)
-
-    html_output = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>OpenAlex Citation Authors Report</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: #f5f5f5;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            padding: 40px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 15px;
-            margin-bottom: 30px;
-        }}
-
-        h2 {{
-            color: #34495e;
-            margin-top: 20px;
-            margin-bottom: 15px;
-        }}
-
-        h3 {{
-            color: #2c3e50;
-            margin-top: 20px;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 15px 0;
-        }}
-
-        th, td {{
-            border: 1px solid #ecf0f1;
-            padding: 8px 10px;
-            text-align: left;
-        }}
-
-        th {{
-            background: #3498db;
-            color: white;
-        }}
-
-        tr:nth-child(even) {{
-            background: #f8f9fa;
-        }}
-
-        .footer {{
-            margin-top: 30px;
-            text-align: center;
-            color: #95a5a6;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>OpenAlex 引用作者明细</h1>
-        <p>以下列表基于 OpenAlex 数据源统计，共涉及 <strong>{total_authors}</strong> 位作者。每位作者条目包含其关联单位（若有）及参与的引用文章题目与年份。</p>
-
-        {authors_html}
-
-        <div class="footer">
-            <p>报告生成时间：{generated_ts}</p>
-            <p>数据来源：OpenAlex API（cites:W2602295025）</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-    return html_output
+        yield section_html
+
+
+def write_html(path: Path, author_index: Dict[str, Dict[str, object]]) -> None:
+    generated_ts = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    total_authors = len(author_index)
+
+    # sort authors by number of articles desc then name
+    sorted_authors = sorted(
+        author_index.items(),
+        key=lambda item: (-len(item[1]["articles"]), item[0].lower()),
+    )
+
+    html_head = REPORT_HEAD.substitute(total_authors=total_authors)
+    html_tail = REPORT_TAIL.substitute(generated_ts=generated_ts)
+
+    # Stream sections straight to disk instead of joining the whole document in memory
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as handle:
+        handle.write(html_head)
+        for idx, section_html in enumerate(iter_author_sections(sorted_authors)):
+            if idx:
+                handle.write("\n")
+            handle.write(section_html)
+        handle.write(html_tail)
 
 
 def main() -> None:
-    df = pd.read_csv(CSV_PATH, encoding="utf-8-sig")
-    df.columns = [
-        "index",
-        "title",
-        "authors",
-        "author_aff_map",
-        "aff_summary",
-        "year",
-        "source_link",
-        "doi",
-        "venue",
-        "notes",
-    ]
+    df = load_dataframe(CSV_PATH, PARQUET_PATH)
 
     author_index = build_author_index(df)
-    html_content = build_html(author_index)
-    OUTPUT_PATH.write_text(html_content, encoding="utf-8")
+    write_html(OUTPUT_PATH, author_index)
 
 
 if __name__ == "__main__":
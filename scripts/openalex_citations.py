@@ -12,15 +12,37 @@ Workflow:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import codecs
+import io
 import json
+import math
 import re
 import sys
-import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import httpx
 import pandas as pd
-import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
 
 # --------------------------------------------------------------------------- #
 # Constants
@@ -28,27 +50,56 @@ import requests
 
 TARGET_DOI = "https://doi.org/10.1016/j.jcp.2017.03.022"
 OPENALEX_WORKS_URL = "https://api.openalex.org/works"
+OPENALEX_PER_PAGE = 200
+OPENALEX_MAX_PAGED_RESULTS = 10000
+OPENALEX_CONCURRENCY = 5
 
 DATA_DIR = Path("data")
 REPORTS_DIR = Path("reports")
 RAW_JSON_PATH = DATA_DIR / "citations_raw.json"
 CSV_OUTPUT_PATH = DATA_DIR / "citations.csv"
+PARQUET_OUTPUT_PATH = DATA_DIR / "citations.parquet"
 MARKDOWN_OUTPUT_PATH = REPORTS_DIR / "citations_summary.md"
 
 HEADERS = {
     "User-Agent": "CitationCollector/0.2 (+https://example.org; mailto:codex-agent@example.com)"
 }
 
-ORIGINAL_AUTHORS = {
-    "peter c ma",
-    "pc ma",
-    "p c ma",
-    "peter ma",
-    "yu lv",
-    "y lv",
-    "matthias ihme",
-    "m ihme",
-}
+ORIGINAL_AUTHORS = frozenset(
+    {
+        "peter c ma",
+        "pc ma",
+        "p c ma",
+        "peter ma",
+        "yu lv",
+        "y lv",
+        "matthias ihme",
+        "m ihme",
+    }
+)
+
+# Below this many records, process start-up and pickling cost more than they save
+PARALLEL_TRANSFORM_THRESHOLD = 5000
+# "counts" skips the author-affiliation map and link fields the summary never reads
+OUTPUT_MODES = ("full", "counts")
+INDEX_COLUMN = "\u7f16\u53f7"
+YEAR_COLUMN = "\u53d1\u8868\u5e74\u4efd"
+
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+
+# Canonical column names of the Parquet copy, read directly by the report scripts
+PARQUET_COLUMNS = [
+    "index",
+    "title",
+    "authors",
+    "author_aff_map",
+    "aff_summary",
+    "year",
+    "source_link",
+    "doi",
+    "venue",
+    "notes",
+]
 
 
 # --------------------------------------------------------------------------- #
@@ -61,14 +112,14 @@ def ensure_directories() -> None:
     REPORTS_DIR.mkdir(exist_ok=True)
 
 
+# Institution and author names repeat heavily across citing works
+@lru_cache(maxsize=8192)
 def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text.replace("\xa0", " ")).strip()
+    return " ".join(text.replace("\xa0", " ").split())
 
 
 def normalize_author_name(name: str) -> str:
-    name = name.lower()
-    name = re.sub(r"[^\w\s]", "", name)
-    return normalize_whitespace(name)
+    return normalize_whitespace(PUNCTUATION_PATTERN.sub("", name.lower()))
 
 
 def format_author_entry(name: str, affiliations: Iterable[str]) -> Tuple[str, List[str]]:
@@ -84,36 +135,99 @@ def load_json(path: Path) -> Any:
     if not path.exists():
         return None
     try:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         return json.loads(path.read_text(encoding="utf-8"))
     except json.JSONDecodeError:
         return None
 
 
+def dump_json(path: Path, data: Any) -> None:
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
 # --------------------------------------------------------------------------- #
 # OpenAlex API helpers
 # --------------------------------------------------------------------------- #
 
 
-def fetch_target_work(session: requests.Session) -> Dict[str, Any]:
-    url = f"{OPENALEX_WORKS_URL}/{TARGET_DOI}"
-    response = session.get(url, timeout=30)
+if msgspec is not None:
+
+    class WorksPageMeta(msgspec.Struct):
+        count: int = 0
+        next_cursor: Optional[str] = None
+
+    class WorksPage(msgspec.Struct):
+        """Envelope of a `/works` list response; unknown keys are skipped while decoding."""
+
+        results: List[Dict[str, Any]] = msgspec.field(default_factory=list)
+        meta: WorksPageMeta = msgspec.field(default_factory=WorksPageMeta)
+
+
+def parse_works_page(response: httpx.Response) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """Return (results, meta.count, meta.next_cursor) of a `/works` list response."""
+    if msgspec is not None:
+        page = msgspec.json.decode(response.content, type=WorksPage)
+        return page.results, page.meta.count, page.meta.next_cursor
+    payload = response.json()
+    meta = payload.get("meta", {})
+    return payload.get("results", []), meta.get("count") or 0, meta.get("next_cursor")
+
+
+async def fetch_target_work(client: httpx.AsyncClient) -> Dict[str, Any]:
+    response = await client.get(f"{OPENALEX_WORKS_URL}/{TARGET_DOI}")
     response.raise_for_status()
     return response.json()
 
 
-def fetch_citing_works(session: requests.Session, work_id: str, sleep: float = 0.2) -> List[Dict[str, Any]]:
-    citing_records: List[Dict[str, Any]] = []
-    cursor = "*"
-    while cursor:
-        params = {"filter": f"cites:{work_id}", "per-page": 200, "cursor": cursor}
-        response = session.get(OPENALEX_WORKS_URL, params=params, timeout=30)
+async def fetch_citing_works(client: httpx.AsyncClient, work_id: str) -> List[Dict[str, Any]]:
+    base_params = {"filter": f"cites:{work_id}", "per-page": OPENALEX_PER_PAGE}
+    semaphore = asyncio.Semaphore(OPENALEX_CONCURRENCY)
+
+    async def fetch_page(params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        async with semaphore:
+            response = await client.get(OPENALEX_WORKS_URL, params={**base_params, **params})
         response.raise_for_status()
-        payload = response.json()
-        citing_records.extend(payload.get("results", []))
-        cursor = payload.get("meta", {}).get("next_cursor")
-        if cursor:
-            time.sleep(sleep)
-    return citing_records
+        return parse_works_page(response)
+
+    citing_records, count, _ = await fetch_page({"page": 1})
+    n_pages = math.ceil(count / OPENALEX_PER_PAGE)
+
+    if count <= OPENALEX_MAX_PAGED_RESULTS:
+        # Page numbers are known up front, so the remaining pages can be fetched concurrently
+        pages = await asyncio.gather(*[fetch_page({"page": page}) for page in range(2, n_pages + 1)])
+        for results, _, _ in pages:
+            citing_records.extend(results)
+    else:
+        # OpenAlex only serves `page=` up to 10k results; beyond that the cursor must be followed serially
+        # Restart from the first cursor page so the two pagination schemes are never mixed
+        citing_records = []
+        cursor: Optional[str] = "*"
+        while cursor:
+            results, _, cursor = await fetch_page({"cursor": cursor})
+            citing_records.extend(results)
+
+    # Guard against a work shifting between pages while they were being fetched
+    seen_ids: set[str] = set()
+    unique_records: List[Dict[str, Any]] = []
+    for record in citing_records:
+        record_id = record.get("id")
+        if record_id in seen_ids:
+            continue
+        if record_id:
+            seen_ids.add(record_id)
+        unique_records.append(record)
+    return unique_records
+
+
+async def collect_citing_records() -> List[Dict[str, Any]]:
+    """Resolve the target work and fetch every work citing it over one HTTP/2 client."""
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, timeout=30.0) as client:
+        target_work = await fetch_target_work(client)
+        return await fetch_citing_works(client, target_work["id"].split("/")[-1])
 
 
 # --------------------------------------------------------------------------- #
@@ -141,23 +255,39 @@ def extract_authors(record: Dict[str, Any]) -> Tuple[List[str], List[List[str]]]
 
 
 def should_exclude_self_citation(authors: Iterable[str]) -> bool:
-    normalized = {normalize_author_name(name) for name in authors if name}
-    return bool(normalized.intersection(ORIGINAL_AUTHORS))
+    return any(normalize_author_name(name) in ORIGINAL_AUTHORS for name in authors if name)
 
 
-def record_to_output_row(index: int, record: Dict[str, Any]) -> Dict[str, Any]:
-    authors, author_affiliations = extract_authors(record)
+def record_to_row_core(
+    index: int,
+    record: Dict[str, Any],
+    authors: List[str],
+    author_affiliations: List[List[str]],
+) -> Dict[str, Any]:
+    """Fields the Markdown summary needs: authors, year and the affiliation summary."""
+    missing_value = "\u4fe1\u606f\u7f3a\u5931"
+    unique_affs = {aff for affs in author_affiliations for aff in affs if aff}
+    aggregated_unique = "; ".join(sorted(unique_affs)) or missing_value
+    return {
+        INDEX_COLUMN: index,
+        "\u5f15\u7528\u8bba\u6587\u9898\u76ee": record.get("display_name") or missing_value,
+        "\u5168\u4f53\u4f5c\u8005": "; ".join(authors) if authors else missing_value,
+        "\u4f5c\u8005\u5355\u4f4d\uff08\u6c47\u603b\uff09": aggregated_unique,
+        YEAR_COLUMN: record.get("publication_year") or missing_value,
+    }
 
-    author_entries: List[str] = []
-    aggregated_affs: List[str] = []
-    for name, affs in zip(authors, author_affiliations):
-        entry, aff_list = format_author_entry(name, affs)
-        author_entries.append(entry)
-        aggregated_affs.extend(aff_list)
 
-    missing_value = "\u4fe1\u606f\u7f3a\u5931"
-    aggregated_unique = "; ".join(sorted({aff for aff in aggregated_affs if aff})) or missing_value
+def record_to_row_full(
+    index: int,
+    record: Dict[str, Any],
+    authors: List[str],
+    author_affiliations: List[List[str]],
+) -> Dict[str, Any]:
+    """The complete CSV row: the core fields plus author-affiliation map, links and venue."""
+    core = record_to_row_core(index, record, authors, author_affiliations)
+    author_entries = [format_author_entry(name, affs)[0] for name, affs in zip(authors, author_affiliations)]
 
+    missing_value = "\u4fe1\u606f\u7f3a\u5931"
     doi = record.get("doi") or (record.get("ids") or {}).get("doi") or ""
     primary_location = record.get("primary_location") or {}
     landing_url = primary_location.get("landing_page_url")
@@ -171,12 +301,12 @@ def record_to_output_row(index: int, record: Dict[str, Any]) -> Dict[str, Any]:
     notes = ["data_source=openalex"]
 
     return {
-        "\u7f16\u53f7": index,
-        "\u5f15\u7528\u8bba\u6587\u9898\u76ee": record.get("display_name") or missing_value,
-        "\u5168\u4f53\u4f5c\u8005": "; ".join(authors) if authors else missing_value,
+        INDEX_COLUMN: index,
+        "\u5f15\u7528\u8bba\u6587\u9898\u76ee": core["\u5f15\u7528\u8bba\u6587\u9898\u76ee"],
+        "\u5168\u4f53\u4f5c\u8005": core["\u5168\u4f53\u4f5c\u8005"],
         "\u4f5c\u8005-\u5355\u4f4d\u6620\u5c04": " | ".join(author_entries) if author_entries else missing_value,
-        "\u4f5c\u8005\u5355\u4f4d\uff08\u6c47\u603b\uff09": aggregated_unique,
-        "\u53d1\u8868\u5e74\u4efd": record.get("publication_year") or missing_value,
+        "\u4f5c\u8005\u5355\u4f4d\uff08\u6c47\u603b\uff09": core["\u4f5c\u8005\u5355\u4f4d\uff08\u6c47\u603b\uff09"],
+        YEAR_COLUMN: core[YEAR_COLUMN],
         "\u6765\u6e90\u94fe\u63a5": landing_url or missing_value,
         "DOI": doi.replace("https://doi.org/", "").lower(),
         "\u671f\u520a/\u4f1a\u8bae": host_venue.get("display_name") or missing_value,
@@ -184,6 +314,70 @@ def record_to_output_row(index: int, record: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def with_string_year(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of ``df`` ready for Arrow, which needs a single type per column."""
+    table = df.copy()
+    # 年份列混有整数与“信息缺失”，统一为字符串以便 Arrow 建表
+    table[YEAR_COLUMN] = table[YEAR_COLUMN].astype(str)
+    return table
+
+
+def write_csv(df: pd.DataFrame, path: Path) -> None:
+    """Write the CSV with a UTF-8 BOM so Excel detects the encoding."""
+    if pacsv is None or df.empty:
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return
+    buffer = io.BytesIO()
+    # Arrow's "needed" style (its default) quotes every string cell, since any
+    # string may contain a delimiter; numeric cells such as the index stay bare.
+    # Unlike pandas' minimal quoting the bytes differ, but readers parse the same values.
+    pacsv.write_csv(
+        pa.Table.from_pandas(with_string_year(df), preserve_index=False),
+        buffer,
+        write_options=pacsv.WriteOptions(quoting_style="needed"),
+    )
+    path.write_bytes(codecs.BOM_UTF8 + buffer.getvalue())
+
+
+def write_parquet(df: pd.DataFrame, path: Path) -> None:
+    if df.empty:
+        return
+    table = with_string_year(df).set_axis(PARQUET_COLUMNS, axis=1)
+    try:
+        table.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    except ImportError:
+        sys.stderr.write("未安装 pyarrow，跳过 Parquet 输出。\n")
+
+
+def transform_record(record: Dict[str, Any], mode: str = "full") -> Optional[Dict[str, Any]]:
+    """Return the output row for one citing work, or None if it is a self-citation.
+
+    The row is numbered 0 here; `transform_records` assigns the final index
+    once the self-citations have been dropped. `mode="counts"` builds only the
+    fields used by the Markdown summary.
+    """
+    # 作者列表只解析一次，同时用于自引过滤与输出行
+    authors, author_affiliations = extract_authors(record)
+    if should_exclude_self_citation(authors):
+        return None
+    row_builder = record_to_row_core if mode == "counts" else record_to_row_full
+    return row_builder(0, record, authors, author_affiliations)
+
+
+def transform_records(records: List[Dict[str, Any]], mode: str = "full") -> List[Dict[str, Any]]:
+    if len(records) >= PARALLEL_TRANSFORM_THRESHOLD:
+        # Pure-Python CPU work: spread large result sets over all cores
+        with ProcessPoolExecutor() as pool:
+            transformed = list(pool.map(partial(transform_record, mode=mode), records, chunksize=256))
+    else:
+        transformed = [transform_record(record, mode) for record in records]
+
+    rows = [row for row in transformed if row is not None]
+    for idx, row in enumerate(rows, start=1):
+        row[INDEX_COLUMN] = idx
+    return rows
+
+
 def build_markdown_summary(df: pd.DataFrame, total_records: int, filtered_records: int) -> str:
     affiliation_column = "\u4f5c\u8005\u5355\u4f4d\uff08\u6c47\u603b\uff09"
     if df.empty:
@@ -250,47 +444,35 @@ def build_markdown_summary(df: pd.DataFrame, total_records: int, filtered_record
 # --------------------------------------------------------------------------- #
 
 
-def main(output_json: Path = RAW_JSON_PATH, force_refresh: bool = False) -> None:
+def main(output_json: Path = RAW_JSON_PATH, force_refresh: bool = False, mode: str = "full") -> None:
     ensure_directories()
 
-    session = requests.Session()
-    session.headers.update(HEADERS)
-
     if not force_refresh:
         cached = load_json(output_json)
         if cached:
             # 尝试直接使用缓存数据
             citing_records = cached
         else:
-            target_work = fetch_target_work(session)
-            citing_records = fetch_citing_works(session, target_work["id"].split("/")[-1])
+            citing_records = asyncio.run(collect_citing_records())
     else:
-        target_work = fetch_target_work(session)
-        citing_records = fetch_citing_works(session, target_work["id"].split("/")[-1])
-
-    output_json.write_text(
-        json.dumps(citing_records, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+        citing_records = asyncio.run(collect_citing_records())
 
-    filtered_records: List[Dict[str, Any]] = []
-    for record in citing_records:
-        authors, _ = extract_authors(record)
-        if should_exclude_self_citation(authors):
-            continue
-        filtered_records.append(record)
+    dump_json(output_json, citing_records)
 
-    rows = [
-        record_to_output_row(idx, record)
-        for idx, record in enumerate(filtered_records, start=1)
-    ]
+    rows = transform_records(citing_records, mode)
+    filtered_records = len(rows)
     df = pd.DataFrame(rows)
-    df.to_csv(CSV_OUTPUT_PATH, index=False, encoding="utf-8-sig")
+    if mode == "full":
+        write_csv(df, CSV_OUTPUT_PATH)
+        write_parquet(df, PARQUET_OUTPUT_PATH)
+    else:
+        # counts 模式只生成 Markdown 摘要，不覆盖报告脚本依赖的完整 CSV/Parquet
+        sys.stderr.write("counts 模式：跳过 CSV 与 Parquet 输出。\n")
 
     summary = build_markdown_summary(
         df,
         total_records=len(citing_records),
-        filtered_records=len(filtered_records),
+        filtered_records=filtered_records,
     )
     MARKDOWN_OUTPUT_PATH.write_text(summary, encoding="utf-8")
 
@@ -304,12 +486,18 @@ if __name__ == "__main__":
         default=RAW_JSON_PATH,
         help="原始引用数据的输出路径。",
     )
+    parser.add_argument(
+        "--mode",
+        choices=OUTPUT_MODES,
+        default="full",
+        help="full 输出完整 CSV/Parquet；counts 仅计算 Markdown 摘要所需字段。",
+    )
     args = parser.parse_args()
     try:
-        main(output_json=args.output_json, force_refresh=args.force_refresh)
-    except requests.HTTPError as exc:
+        main(output_json=args.output_json, force_refresh=args.force_refresh, mode=args.mode)
+    except httpx.HTTPStatusError as exc:
         sys.stderr.write(f"HTTP 请求失败: {exc}\n")
         sys.exit(1)
-    except requests.RequestException as exc:
+    except httpx.HTTPError as exc:
         sys.stderr.write(f"网络请求异常: {exc}\n")
         sys.exit(1)
@@ -0,0 +1,27 @@
+"""
+HTML helpers shared by generate_openalex_report.py and generate_author_report.py.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from string import Template
+from typing import Tuple
+
+# Page skeletons and CSS of both reports
+TEMPLATES_DIR = Path(__file__).resolve().with_name("templates")
+
+# Same replacements as html.escape(quote=True), applied in one translate pass
+_HTML_TABLE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def escape_html(text: str) -> str:
+    return text.translate(_HTML_TABLE)
+
+
+def load_report_template(name: str, placeholder: str) -> Tuple[Template, Template]:
+    """Split a report template around its streamed section list into head and tail."""
+    head, tail = (TEMPLATES_DIR / name).read_text(encoding="utf-8").split(f"${{{placeholder}}}")
+    return Template(head), Template(tail)